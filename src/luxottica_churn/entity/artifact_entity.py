@@ -2,5 +2,20 @@
 # Created on 2025-05-16
 
 """
-Module docstring
+Artifact entities produced by the pipeline stages
 """
+
+from typing import Any, Dict
+
+import msgspec
+
+
+class ModelMetadata(msgspec.Struct, forbid_unknown_fields=True):
+    """
+    Metadata saved next to a trained model (see utils.common.save_model).
+    Encoded with msgspec's typed JSON codec; decoding rejects unknown fields
+    rather than silently dropping them (put extra values in `extra`).
+    """
+    algorithm: str
+    training_date: str
+    extra: Dict[str, Any] = {}
@@ -1,54 +1,235 @@
 import os
 import sys
+import shutil
+import threading
 import yaml
-import json
+import orjson
+import msgspec
+import pickle
 import joblib
+import zstandard as zstd
+import numpy as np
 import pandas as pd
 from box import ConfigBox
 from box.exceptions import BoxValueError
 from pathlib import Path
-from typing import Any, Optional, List
-from ensure import ensure_annotations
+from typing import Any, Dict, Optional, List, Tuple, Union
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 import logging
 
 # Initialize logger (assuming your logger.py is in the same utils folder)
 from .logger import logger  # Relative import
+from ..entity.artifact_entity import ModelMetadata
+
+# Runtime annotation checks are only enabled for dev/test runs (LUX_TYPECHECK=1)
+if os.getenv("LUX_TYPECHECK") == "1":
+    from ensure import ensure_annotations
+else:
+    def ensure_annotations(func):
+        """No-op stand-in for ensure.ensure_annotations."""
+        return func
+
+# Prefer the libyaml-backed C loader; the pure-Python parser is ~10x slower
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+    logger.warning("LibYAML bindings unavailable, falling back to pure-Python YAML parser")
+
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+# read_csv options the pyarrow engine rejects; calls using them stay on the C engine
+_PYARROW_UNSUPPORTED_KWARGS = frozenset({
+    "chunksize", "comment", "converters", "dayfirst", "decimal", "delim_whitespace",
+    "dialect", "error_bad_lines", "float_precision", "infer_datetime_format",
+    "iterator", "lineterminator", "low_memory", "memory_map", "nrows",
+    "on_bad_lines", "quoting", "skipfooter", "skipinitialspace", "thousands",
+    "verbose", "warn_bad_lines",
+})
+
+# read_csv options that affect which header row/columns a file has
+_CSV_HEADER_KWARGS = ("sep", "delimiter", "header", "names", "skiprows", "encoding", "compression")
+
+_COLUMNAR_FORMATS = {".parquet": "Parquet", ".feather": "Feather"}
+
+def _encode_numpy(obj: Any) -> Any:
+    """msgspec enc_hook for numpy scalars/arrays (e.g. sklearn metric values)."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise NotImplementedError(f"Objects of type {type(obj).__name__} are not supported")
+
+_METADATA_ENCODER = msgspec.json.Encoder(enc_hook=_encode_numpy)
+_METADATA_DECODER = msgspec.json.Decoder(ModelMetadata)
+
+_KB = 1024
+_MB = _KB * _KB
+
+_IO_BUFFER_SIZE = 1 << 20  # 1 MiB
+_ZSTD_LEVEL = 3
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"  # zstd frame header, used to tell save_bin files from joblib ones
 
 # -----------------------------------------------------------
 # CORE FILE & DIRECTORY OPERATIONS
 # -----------------------------------------------------------
 
+@lru_cache(maxsize=128)
+def _load_yaml_cached(path_str: str, mtime_ns: int) -> Any:
+    """
+    Parse a YAML file once per (path, mtime) pair.
+    The raw content is cached rather than the ConfigBox to keep entries small.
+    """
+    with open(path_str, 'r') as yaml_file:
+        content = yaml.load(yaml_file, Loader=SafeLoader)
+    if not content:
+        raise BoxValueError("YAML file is empty")
+    return content
+
+# Shared ConfigBox per (resolved path, mtime_ns), so hot reads skip the box conversion
+_CONFIGBOX_CACHE: Dict[Tuple[str, int], ConfigBox] = {}
+_CONFIGBOX_CACHE_LOCK = threading.Lock()
+
 @ensure_annotations
-def read_yaml(path_to_yaml: Path) -> ConfigBox:
+def read_yaml(path_to_yaml: Path, copy: bool = False) -> ConfigBox:
     """
     Read a YAML file and return a ConfigBox for dot notation access.
+    Results are cached until the file's mtime changes, and the same ConfigBox
+    instance is returned to every caller; pass copy=True to get a private
+    copy that is safe to mutate.
     Raises:
         ValueError: If YAML is empty or invalid.
     """
     try:
-        with open(path_to_yaml, 'r') as yaml_file:
-            content = yaml.safe_load(yaml_file)
-            if not content:
-                raise BoxValueError("YAML file is empty")
-            logger.info(f"YAML loaded: {path_to_yaml}")
-            return ConfigBox(content)
+        resolved = str(Path(path_to_yaml).resolve())
+        key = (resolved, os.stat(resolved).st_mtime_ns)
+        config = _CONFIGBOX_CACHE.get(key)
+        if config is None:
+            config = ConfigBox(_load_yaml_cached(*key))
+            with _CONFIGBOX_CACHE_LOCK:
+                # Drop entries for older versions of the same file
+                for stale in [k for k in _CONFIGBOX_CACHE if k[0] == resolved]:
+                    _CONFIGBOX_CACHE.pop(stale, None)
+                config = _CONFIGBOX_CACHE.setdefault(key, config)
+        logger.info("YAML loaded: %s", path_to_yaml)
+        return ConfigBox(config.to_dict()) if copy else config
     except Exception as e:
-        logger.error(f"Error reading YAML at {path_to_yaml}: {e}")
+        logger.error("Error reading YAML at %s: %s", path_to_yaml, e)
         raise
 
+def _clear_yaml_caches():
+    """Clear the parsed-YAML, header and ConfigBox caches used by read_yaml."""
+    _load_yaml_cached.cache_clear()
+    _load_yaml_header_cached.cache_clear()
+    with _CONFIGBOX_CACHE_LOCK:
+        _CONFIGBOX_CACHE.clear()
+
+read_yaml.cache_clear = _clear_yaml_caches
+
+@lru_cache(maxsize=128)
+def _load_yaml_header_cached(
+    path_str: str, mtime_ns: int, keys: Tuple[str, ...], max_lines: int
+) -> Optional[dict]:
+    """
+    Parse the head of a YAML file once per (path, mtime, keys) and return the
+    requested top-level keys, or None if they are not all found there.
+    """
+    with open(path_str, 'r') as yaml_file:
+        lines = list(islice(yaml_file, max_lines + 1))
+
+    if len(lines) > max_lines:
+        # Drop the (possibly truncated) last top-level entry
+        boundary = max(
+            (i for i, line in enumerate(lines) if line[:1] not in ("", " ", "\t", "\n", "#", "-")),
+            default=0,
+        )
+        lines = lines[:boundary]
+
+    try:
+        content = yaml.load("".join(lines), Loader=SafeLoader)
+    except yaml.YAMLError:
+        return None
+
+    if isinstance(content, dict) and all(key in content for key in keys):
+        return {key: content[key] for key in keys}
+    return None
+
+@ensure_annotations
+def read_yaml_header(
+    path_to_yaml: Path, keys: List[str], max_lines: int = 40, copy: bool = False
+) -> ConfigBox:
+    """
+    Read only the top-level `keys` from the head of a YAML file.
+    Parses the first `max_lines` lines, trimmed back to the last top-level key so
+    no mapping is cut in half; falls back to read_yaml if a key is not found there.
+    Shares read_yaml's (path, mtime) caching, so repeated lookups cost one stat.
+    As with read_yaml, the result may be the shared cached ConfigBox; pass
+    copy=True to get a private copy that is safe to mutate.
+    """
+    resolved = str(Path(path_to_yaml).resolve())
+    key = (resolved, os.stat(resolved).st_mtime_ns)
+
+    # A full parse of this version of the file is already cached
+    config = _CONFIGBOX_CACHE.get(key)
+    if config is not None:
+        return ConfigBox(config.to_dict()) if copy else config
+
+    header = _load_yaml_header_cached(*key, tuple(keys), max_lines)
+    if header is not None:
+        logger.info("YAML header loaded: %s | Keys: %s", path_to_yaml, keys)
+        header_box = ConfigBox(header)
+        return ConfigBox(header_box.to_dict()) if copy else header_box
+    return read_yaml(path_to_yaml, copy=copy)
+
 @ensure_annotations
 def create_directories(path_to_directories: List[Path], verbose: bool = True):
     """
     Create directories if they don't exist.
+    Paths are deduplicated and each one is walked up only until an existing
+    directory is found, so existing trees cost a single stat per path and
+    only missing directories are created.
     Args:
         path_to_directories: List of directory paths
         verbose: Log creation events (default: True)
     """
-    for path in path_to_directories:
-        os.makedirs(path, exist_ok=True)
-        if verbose:
-            logger.info(f"Created directory: {path}")
+    unique = sorted({Path(os.path.abspath(p)) for p in path_to_directories}, key=lambda p: len(p.parts))
+    existing = set()
+    created = 0
+    for path in unique:
+        missing = []
+        current = path
+        while current not in existing and not current.is_dir():
+            missing.append(current)
+            current = current.parent
+        existing.add(current)
+        for directory in reversed(missing):
+            try:
+                os.mkdir(directory)
+                created += 1
+            except FileExistsError:
+                # Match os.makedirs(exist_ok=True): only an existing directory is fine
+                if not directory.is_dir():
+                    raise
+            existing.add(directory)
+    if verbose:
+        logger.info("Created %d directories", created)
+
+@ensure_annotations
+def copy_file(src: Path, dst: Path):
+    """
+    Copy a file's contents with shutil.copyfile, which uses os.sendfile on
+    Linux so the bytes stay in the kernel instead of passing through Python.
+    Raises:
+        shutil.SameFileError: If src and dst are the same file.
+    """
+    shutil.copyfile(src, dst)
+    logger.info("File copied: %s -> %s", src, dst)
 
 # -----------------------------------------------------------
 # DATA SERIALIZATION
@@ -56,30 +237,72 @@ def create_directories(path_to_directories: List[Path], verbose: bool = True):
 
 @ensure_annotations
 def save_json(path: Path, data: dict, indent: int = 4):
-    """Save dictionary as JSON with pretty printing."""
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=indent)
-    logger.info(f"JSON saved: {path} (~{get_size(path)})")
+    """
+    Save dictionary as JSON with orjson; numpy arrays/scalars serialize natively.
+    orjson only supports 2-space indentation, so any non-zero `indent` maps to it.
+    Note: NaN and +/-inf are written as `null` (stdlib json wrote `NaN`/`Infinity`),
+    so non-finite metrics come back from load_json as None.
+    """
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    with open(path, 'wb') as f:
+        size = f.write(orjson.dumps(data, option=option))
+    logger.info("JSON saved: %s (~%s)", path, get_size(size))
 
 @ensure_annotations
 def load_json(path: Path) -> ConfigBox:
     """Load JSON file into ConfigBox for dot notation access."""
-    with open(path, 'r') as f:
-        content = json.load(f)
-    logger.info(f"JSON loaded: {path}")
+    content = orjson.loads(Path(path).read_bytes())
+    logger.info("JSON loaded: %s", path)
     return ConfigBox(content)
 
 @ensure_annotations
 def save_bin(data: Any, path: Path):
-    """Save binary data (e.g., models) using joblib."""
-    joblib.dump(data, path)
-    logger.info(f"Binary saved: {path} (~{get_size(path)})")
+    """
+    Save binary data (e.g., models) as a zstd-compressed pickle (protocol 5).
+    The pickle is streamed through a multithreaded compressor, so peak memory
+    stays near the compressor's window rather than a second copy of the model.
+    Paths ending in `.joblib` are written as uncompressed joblib so that
+    load_bin can memory-map their arrays.
+    """
+    if Path(path).suffix == ".joblib":
+        joblib.dump(data, path, compress=0)
+        size = get_size(path)
+    else:
+        with open(path, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+            counter = _CountingWriter(f)
+            compressor = zstd.ZstdCompressor(level=_ZSTD_LEVEL, threads=-1)
+            with compressor.stream_writer(counter, size=-1) as stream:
+                pickle.dump(data, stream, protocol=5)
+        size = get_size(counter.bytes_written)
+    logger.info("Binary saved: %s (~%s)", path, size)
 
 @ensure_annotations
-def load_bin(path: Path) -> Any:
-    """Load binary file (e.g., models)."""
-    data = joblib.load(path)
-    logger.info(f"Binary loaded: {path}")
+def load_bin(path: Path, mmap_mode: Optional[str] = None, buffering: int = 4 << 20) -> Any:
+    """
+    Load binary file (e.g., models) written by save_bin or joblib.
+    Args:
+        mmap_mode: Passed to joblib.load for uncompressed joblib files. Use 'r'
+            for inference to share read-only arrays through the page cache;
+            keep None for training since mapped arrays cannot be modified.
+            Ignored for zstd pickles, which are always loaded into memory.
+        buffering: Read-ahead buffer size in bytes (default: 4 MiB)
+    """
+    with open(path, 'rb', buffering=buffering) as f:
+        # read+seek rather than peek(), which unbuffered (buffering=0) files lack
+        is_zstd = f.read(len(_ZSTD_MAGIC)) == _ZSTD_MAGIC
+        f.seek(0)
+        if is_zstd:
+            with zstd.ZstdDecompressor().stream_reader(f) as stream:
+                data = pickle.load(stream)
+        elif mmap_mode is None:
+            data = joblib.load(f)
+
+    if not is_zstd and mmap_mode is not None:
+        # Memory-mapping needs the path rather than an open handle
+        data = joblib.load(path, mmap_mode=mmap_mode)
+    logger.info("Binary loaded: %s", path)
     return data
 
 # -----------------------------------------------------------
@@ -87,20 +310,105 @@ def load_bin(path: Path) -> Any:
 # -----------------------------------------------------------
 
 @ensure_annotations
-def load_csv(path: Path, **kwargs) -> pd.DataFrame:
+def load_csv(
+    path: Path,
+    use_arrow: bool = True,
+    schema_path: Optional[Path] = None,
+    buffering: int = 4 << 20,
+    **kwargs
+) -> pd.DataFrame:
     """
     Load CSV with pandas and log shape.
-    kwargs: Additional args for pd.read_csv()
+    `.parquet`/`.feather` paths are read as Arrow columnar files instead.
+    Args:
+        use_arrow: Parse with the multithreaded pyarrow engine when installed and
+            no kwargs it doesn't support (e.g. chunksize, nrows) are passed
+        schema_path: Schema YAML whose `dtypes` are passed to the parser so
+            column types are not inferred (explicit `dtype` kwargs win)
+        buffering: Read-ahead buffer size in bytes for plain `.csv` files
+            (default: 4 MiB), cutting read() syscalls on large files
+    kwargs: Additional args for pd.read_csv() (or the columnar reader)
     """
-    df = pd.read_csv(path, **kwargs)
-    logger.info(f"CSV loaded: {path} | Shape: {df.shape}")
+    suffix = Path(path).suffix
+    if suffix in _COLUMNAR_FORMATS:
+        if suffix == ".parquet":
+            df = pd.read_parquet(path, engine="pyarrow", **kwargs)
+        else:
+            df = pd.read_feather(path, **kwargs)
+        logger.info("%s loaded: %s | Shape: %s", _COLUMNAR_FORMATS[suffix], path, df.shape)
+        return df
+
+    if schema_path is not None:
+        dtype = kwargs.get("dtype")
+        if dtype is None or isinstance(dtype, dict):
+            # Only pass schema dtypes for columns the file actually has
+            header_kwargs = {k: kwargs[k] for k in _CSV_HEADER_KWARGS if k in kwargs}
+            columns = set(pd.read_csv(path, nrows=0, **header_kwargs).columns)
+            schema_dtypes = read_yaml_header(schema_path, ["dtypes"]).dtypes
+            kwargs["dtype"] = {
+                **{col: t for col, t in schema_dtypes.items() if col in columns},
+                **(dtype or {}),
+            }
+
+    use_arrow = use_arrow and _HAS_PYARROW and not _PYARROW_UNSUPPORTED_KWARGS.intersection(kwargs)
+    if "engine" not in kwargs and use_arrow:
+        # Only the parser changes: columns keep the default NumPy-backed dtypes
+        kwargs["engine"] = "pyarrow"
+    elif kwargs.get("engine", "c") == "c":
+        kwargs.setdefault("low_memory", False)
+
+    if suffix == ".csv" and not (kwargs.get("chunksize") or kwargs.get("iterator")):
+        with open(path, 'rb', buffering=buffering) as f:
+            df = pd.read_csv(f, **kwargs)
+    else:
+        # Compressed inputs and lazy readers keep pandas' own path handling
+        df = pd.read_csv(path, **kwargs)
+    if isinstance(df, pd.DataFrame):
+        logger.info("CSV loaded: %s | Shape: %s", path, df.shape)
+    else:
+        logger.info("CSV reader opened: %s", path)
     return df
 
 @ensure_annotations
-def save_csv(data: pd.DataFrame, path: Path, **kwargs):
-    """Save DataFrame to CSV with validation."""
-    data.to_csv(path, **kwargs)
-    logger.info(f"CSV saved: {path} | Size: {get_size(path)}")
+def save_csv(data: pd.DataFrame, path: Path, chunksize: Optional[int] = None, **kwargs):
+    """
+    Save DataFrame to CSV with validation.
+    CSV rows are already serialized in chunks by pandas (about 100k cells per
+    chunk by default); pass `chunksize` only to override that row count. `.gz`
+    paths are written with gzip compresslevel=1 instead of pandas' default 9,
+    trading some size for much faster writes.
+    `.parquet` (zstd) and `.feather` (lz4) paths are written as Arrow columnar
+    files, which round-trip much faster and keep dtypes; prefer them for
+    artifacts handed between pipeline stages. Feather requires a default
+    RangeIndex, so any other index is written as columns (or dropped with
+    index=False) and comes back as a fresh RangeIndex.
+    """
+    suffix = Path(path).suffix
+    if suffix == ".parquet":
+        kwargs.setdefault("compression", "zstd")
+        data.to_parquet(path, engine="pyarrow", **kwargs)
+    elif suffix == ".feather":
+        # Feather only stores a default RangeIndex: keep any other index as
+        # columns, or drop it when the caller passed index=False
+        index = kwargs.pop("index", True)
+        if not (data.index.equals(pd.RangeIndex(len(data))) and data.index.name is None):
+            data = data.reset_index(drop=not index)
+        kwargs.setdefault("compression", "lz4")
+        data.to_feather(path, **kwargs)
+    else:
+        if chunksize is not None:
+            kwargs["chunksize"] = chunksize
+        if suffix == ".gz":
+            kwargs.setdefault("compression", {"method": "gzip", "compresslevel": 1})
+        data.to_csv(path, **kwargs)
+    logger.info("%s saved: %s | Size: %s", _COLUMNAR_FORMATS.get(suffix, "CSV"), path, get_size(path))
+
+def _normalize_dtype(dtype: Any) -> Any:
+    """Resolve schema aliases like `str`/`int` to the dtype pandas would compare against."""
+    try:
+        return pd.api.types.pandas_dtype(dtype)
+    except TypeError:
+        return dtype
 
 @ensure_annotations
 def validate_data_schema(df: pd.DataFrame, schema_path: Path) -> bool:
@@ -112,18 +420,22 @@ def validate_data_schema(df: pd.DataFrame, schema_path: Path) -> bool:
             customer_id: str
             churn: int
     """
-    schema = read_yaml(schema_path)
+    schema = read_yaml_header(schema_path, ["required_columns", "dtypes"])
     
     # Check required columns
-    missing_cols = set(schema.required_columns) - set(df.columns)
-    if missing_cols:
-        logger.error(f"Missing columns: {missing_cols}")
-        raise ValueError(f"Schema validation failed. Missing: {missing_cols}")
+    missing_cols = pd.Index(schema.required_columns).difference(df.columns, sort=False)
+    if len(missing_cols):
+        logger.error("Missing columns: %s", missing_cols.tolist())
+        raise ValueError(f"Schema validation failed. Missing: {missing_cols.tolist()}")
     
-    # Check dtypes (optional)
-    for col, dtype in schema.dtypes.items():
-        if col in df.columns and not pd.api.types.is_dtype_equal(df[col].dtype, dtype):
-            logger.warning(f"Column '{col}' has dtype {df[col].dtype}, expected {dtype}")
+    # Check dtypes (optional) in one vectorized comparison
+    expected = pd.Series(schema.dtypes, dtype=object).map(_normalize_dtype).astype(str)
+    cols = expected.index.intersection(df.columns)
+    actual = df.dtypes.reindex(cols).astype(str)
+    mismatch = cols[actual.values != expected.loc[cols].values]
+    if len(mismatch):
+        details = ", ".join(f"'{col}' has {actual[col]}, expected {schema.dtypes[col]}" for col in mismatch)
+        logger.warning("Dtype mismatches: %s", details)
     
     logger.info("Data schema validation passed")
     return True
@@ -133,26 +445,60 @@ def validate_data_schema(df: pd.DataFrame, schema_path: Path) -> bool:
 # -----------------------------------------------------------
 
 @ensure_annotations
-def save_model(model: Any, path: Path, metadata: Optional[dict] = None):
+def save_model(
+    model: Any,
+    path: Path,
+    metadata: Optional[Union[ModelMetadata, dict]] = None,
+    staging_dir: Optional[Path] = None
+):
     """
     Save model with optional metadata.
+    ModelMetadata is written with a schema-specific msgspec encoder (numpy
+    values in `extra` are converted); plain dicts of any shape go through
+    save_json. Both are written as 2-space indented JSON.
+    If staging_dir is given, the saved files are mirrored there with copy_file
+    (e.g., for a later S3 sync) without re-serializing the model.
     Example metadata:
-        {"algorithm": "XGBoost", "training_date": "2023-10-05"}
+        ModelMetadata(algorithm="XGBoost", training_date="2023-10-05")
     """
     save_bin(model, path)
+    saved_paths = [Path(path)]
     if metadata:
         metadata_path = Path(f"{path}.metadata.json")
-        save_json(metadata_path, metadata)
-        logger.info(f"Model metadata saved: {metadata_path}")
+        if isinstance(metadata, ModelMetadata):
+            # Indented like save_json so every .metadata.json has one layout
+            encoded = msgspec.json.format(_METADATA_ENCODER.encode(metadata), indent=2)
+            metadata_path.write_bytes(encoded)
+        else:
+            save_json(metadata_path, metadata)
+        logger.info("Model metadata saved: %s", metadata_path)
+        saved_paths.append(metadata_path)
+    if staging_dir is not None:
+        create_directories([staging_dir], verbose=False)
+        for saved_path in saved_paths:
+            target = Path(staging_dir) / saved_path.name
+            if target.exists() and os.path.samefile(saved_path, target):
+                continue  # already saved in the staging dir
+            copy_file(saved_path, target)
 
 @ensure_annotations
-def load_model(path: Path) -> Any:
-    """Load model and its metadata if available."""
-    model = load_bin(path)
+def load_model(path: Path, mmap_mode: Optional[str] = 'r') -> Any:
+    """
+    Load model and its metadata if available.
+    Metadata is decoded as ModelMetadata when it matches the schema, otherwise
+    as a plain dict.
+    Models saved as `.joblib` are memory-mapped read-only by default;
+    pass mmap_mode=None to get writable arrays (e.g., for retraining).
+    """
+    model = load_bin(path, mmap_mode=mmap_mode)
     metadata_path = Path(f"{path}.metadata.json")
     if metadata_path.exists():
-        metadata = load_json(metadata_path)
-        logger.info(f"Model metadata: {metadata}")
+        try:
+            metadata = _METADATA_DECODER.decode(metadata_path.read_bytes())
+        except msgspec.ValidationError:
+            # Not ModelMetadata-shaped (e.g. dict metadata); fall back to generic JSON
+            metadata = load_json(metadata_path)
+        logger.info("Model metadata: %s", metadata)
     return model
 
 # -----------------------------------------------------------
@@ -160,15 +506,36 @@ def load_model(path: Path) -> Any:
 # -----------------------------------------------------------
 
 @ensure_annotations
-def get_size(path: Path) -> str:
-    """Get file size in human-readable format (KB/MB)."""
-    size_bytes = os.path.getsize(path)
-    if size_bytes < 1024:
+def get_size(path_or_size: Union[Path, int]) -> str:
+    """
+    Get file size in human-readable format (KB/MB).
+    Pass a byte count instead of a path to skip the stat call.
+    """
+    if isinstance(path_or_size, int):
+        size_bytes = path_or_size
+    else:
+        size_bytes = os.path.getsize(path_or_size)
+    if size_bytes < _KB:
         return f"{size_bytes} B"
-    elif size_bytes < 1024**2:
-        return f"{size_bytes / 1024:.2f} KB"
+    elif size_bytes < _MB:
+        return f"{size_bytes / _KB:.2f} KB"
     else:
-        return f"{size_bytes / (1024**2):.2f} MB"
+        return f"{size_bytes / _MB:.2f} MB"
+
+class _CountingWriter:
+    """Write-through file proxy that counts bytes, so callers need no stat afterwards."""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.bytes_written = 0
+
+    def write(self, data) -> int:
+        written = self._raw.write(data)
+        self.bytes_written += written
+        return written
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
 
 # -----------------------------------------------------------
 # EXAMPLE USAGE (FOR TESTING)
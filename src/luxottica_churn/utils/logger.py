@@ -5,10 +5,41 @@ Handles both file and console logging with rotation and detailed formatting
 
 import os
 import sys
+import queue
+import atexit
 import logging
 from datetime import datetime
 from typing import Optional
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+# Source location (funcName/lineno) costs a sys._getframe walk per record, and
+# thread/process info extra lookups; only collect them when LUX_VERBOSE_LOG=1
+VERBOSE_LOG = os.getenv("LUX_VERBOSE_LOG") == "1"
+if not VERBOSE_LOG:
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+
+# Loggers whose handlers run behind a QueueListener, by name
+_QUEUED_LOGGERS = {}
+
+def _use_direct_handlers_after_fork():
+    """
+    The QueueListener thread does not survive fork, so records queued in a child
+    would never be written. Attach the listener's handlers directly instead.
+    """
+    for logger in _QUEUED_LOGGERS.values():
+        listener = logger._listener
+        atexit.unregister(listener.stop)
+        logger.handlers.clear()
+        for handler in listener.handlers:
+            logger.addHandler(handler)
+        logger._listener = None
+    _QUEUED_LOGGERS.clear()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_use_direct_handlers_after_fork)
 
 def setup_logger(
     name: str = "luxottica_churn",
@@ -20,6 +51,8 @@ def setup_logger(
 ) -> logging.Logger:
     """
     Configures a production-ready logger with file rotation and console output.
+    Handlers sit behind a QueueListener, so logging calls never block on I/O;
+    forked child processes log through the handlers directly.
     
     Args:
         name: Logger name (will appear in logs)
@@ -35,11 +68,14 @@ def setup_logger(
     # Create log directory if needed
     os.makedirs(log_dir, exist_ok=True)
     
-    # Configure log format
-    log_format = (
-        "[%(asctime)s] [%(levelname)s] "
-        "[%(module)s.%(funcName)s:%(lineno)d] - %(message)s"
-    )
+    # Configure log format (source location only in verbose mode, see above)
+    if VERBOSE_LOG:
+        log_format = (
+            "[%(asctime)s] [%(levelname)s] "
+            "[%(module)s.%(funcName)s:%(lineno)d] - %(message)s"
+        )
+    else:
+        log_format = "[%(asctime)s] [%(levelname)s] [%(name)s] - %(message)s"
     formatter = logging.Formatter(log_format)
     
     # Initialize logger
@@ -47,6 +83,12 @@ def setup_logger(
     logger.setLevel(log_level)
     
     # Prevent duplicate handlers in Jupyter/IPython
+    previous_listener = getattr(logger, "_listener", None)
+    if previous_listener is not None:
+        atexit.unregister(previous_listener.stop)
+        previous_listener.stop()
+        for handler in previous_listener.handlers:
+            handler.close()
     if logger.hasHandlers():
         logger.handlers.clear()
     
@@ -61,13 +103,22 @@ def setup_logger(
         encoding='utf-8'
     )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    handlers = [file_handler]
     
     # Configure console output if enabled
     if console_output:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
+    
+    # Callers only enqueue records; file and console I/O run on a background thread
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    logger._listener = listener
+    atexit.register(listener.stop)
+    _QUEUED_LOGGERS[name] = logger
     
     return logger
 
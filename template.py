@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 import logging
 from datetime import datetime
+from collections import defaultdict
 
 # Configure logging
 logging.basicConfig(
@@ -81,27 +82,43 @@ list_of_files = [
     "docs/api_spec.yaml"
 ]
 
+# Template bodies, encoded once instead of formatted per file
+TEMPLATE_PY_BYTES = f'# {project_name}\n# Created on {current_date}\n\n"""\nModule docstring\n"""\n'.encode()
+TEMPLATE_DOCKERFILE_BYTES = f'# {project_name} Dockerfile\nFROM python:3.9-slim\n\nWORKDIR /app\n\nCOPY requirements.txt .\nRUN pip install --no-cache-dir -r requirements.txt\n\nCOPY . .\n\nCMD ["python", "app.py"]'.encode()
+
+def template_bytes(filepath: Path) -> bytes:
+    if filepath.suffix == '.py':
+        return TEMPLATE_PY_BYTES
+    elif filepath.name == 'Dockerfile':
+        return TEMPLATE_DOCKERFILE_BYTES
+    return b''
+
 def create_project_structure():
     try:
+        # Group files by parent so each directory is listed only once
+        files_by_dir = defaultdict(list)
         for filepath in list_of_files:
             filepath = Path(filepath)
-            filedir = filepath.parent
-            
+            files_by_dir[filepath.parent].append(filepath)
+
+        for filedir, filepaths in files_by_dir.items():
             # Create directory if needed
             if not filedir.exists():
                 filedir.mkdir(parents=True, exist_ok=True)
                 logger.info(f"Created directory: {filedir}")
-            
-            # Create empty file if it doesn't exist
-            if not filepath.exists() or os.path.getsize(filepath) == 0:
-                with open(filepath, 'w') as f:
-                    if filepath.suffix == '.py':
-                        f.write(f'# {project_name}\n# Created on {current_date}\n\n"""\nModule docstring\n"""\n')
-                    elif filepath.name == 'Dockerfile':
-                        f.write(f'# {project_name} Dockerfile\nFROM python:3.9-slim\n\nWORKDIR /app\n\nCOPY requirements.txt .\nRUN pip install --no-cache-dir -r requirements.txt\n\nCOPY . .\n\nCMD ["python", "app.py"]')
-                logger.info(f"Created file: {filepath}")
-            else:
-                logger.info(f"File exists: {filepath}")
+
+            # One scandir per directory instead of exists() + getsize() per file
+            wanted = {filepath.name for filepath in filepaths}
+            with os.scandir(filedir) as entries:
+                sizes = {e.name: e.stat().st_size for e in entries if e.name in wanted}
+
+            # Create file if it doesn't exist or is empty
+            for filepath in filepaths:
+                if not sizes.get(filepath.name):
+                    filepath.write_bytes(template_bytes(filepath))
+                    logger.info(f"Created file: {filepath}")
+                else:
+                    logger.info(f"File exists: {filepath}")
                 
         logger.info("Project structure created successfully!")
         
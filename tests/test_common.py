@@ -0,0 +1,414 @@
+import atexit
+import logging
+import os
+import shutil
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from logging.handlers import QueueHandler
+
+from luxottica_churn.entity.artifact_entity import ModelMetadata
+from luxottica_churn.utils import common
+from luxottica_churn.utils.logger import setup_logger
+from luxottica_churn.utils.common import (
+    copy_file,
+    create_directories,
+    load_bin,
+    load_csv,
+    load_model,
+    read_yaml,
+    read_yaml_header,
+    save_bin,
+    save_csv,
+    save_model,
+    validate_data_schema,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_yaml_caches():
+    read_yaml.cache_clear()
+    yield
+    read_yaml.cache_clear()
+
+
+def _sample_model():
+    return {"weights": np.arange(1000, dtype=np.float64), "algorithm": "XGBoost"}
+
+
+def test_save_bin_load_bin_zstd_roundtrip(tmp_path):
+    path = tmp_path / "model.pkl"
+    save_bin(_sample_model(), path)
+
+    assert path.read_bytes()[:4] == b"\x28\xb5\x2f\xfd"
+    loaded = load_bin(path)
+    assert loaded["algorithm"] == "XGBoost"
+    np.testing.assert_array_equal(loaded["weights"], np.arange(1000, dtype=np.float64))
+
+
+@pytest.mark.parametrize("suffix", [".pkl", ".joblib"])
+@pytest.mark.parametrize("buffering", [0, 1 << 20])
+def test_load_bin_buffering_sizes(tmp_path, suffix, buffering):
+    path = tmp_path / f"model{suffix}"
+    save_bin(_sample_model(), path)
+
+    loaded = load_bin(path, buffering=buffering)
+    np.testing.assert_array_equal(loaded["weights"], np.arange(1000, dtype=np.float64))
+
+
+def test_save_bin_load_bin_joblib_mmap_roundtrip(tmp_path):
+    path = tmp_path / "model.joblib"
+    save_bin(_sample_model(), path)
+
+    loaded = load_bin(path, mmap_mode="r")
+    assert isinstance(loaded["weights"], np.memmap)
+    np.testing.assert_array_equal(loaded["weights"], np.arange(1000, dtype=np.float64))
+
+    # Without mmap the arrays are regular, writable copies
+    assert not isinstance(load_bin(path)["weights"], np.memmap)
+
+
+@pytest.mark.parametrize("compress", [0, 3])
+def test_load_bin_reads_legacy_joblib_files(tmp_path, compress):
+    path = tmp_path / "legacy_model.pkl"
+    joblib.dump(_sample_model(), path, compress=compress)
+
+    loaded = load_bin(path)
+    assert loaded["algorithm"] == "XGBoost"
+    np.testing.assert_array_equal(loaded["weights"], np.arange(1000, dtype=np.float64))
+
+
+def _bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_read_yaml_reparses_after_mtime_change(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("model:\n  name: xgb\n")
+    assert read_yaml(path).model.name == "xgb"
+
+    path.write_text("model:\n  name: rf\n")
+    _bump_mtime(path)
+
+    assert read_yaml(path).model.name == "rf"
+
+
+@pytest.fixture
+def full_parse_calls(monkeypatch):
+    calls = []
+    full_read_yaml = common.read_yaml
+
+    def spy(path_to_yaml, *args, **kwargs):
+        calls.append(path_to_yaml)
+        return full_read_yaml(path_to_yaml, *args, **kwargs)
+
+    monkeypatch.setattr(common, "read_yaml", spy)
+    return calls
+
+
+def test_read_yaml_header_falls_back_when_key_is_cut_off(tmp_path, full_parse_calls):
+    path = tmp_path / "schema.yaml"
+    path.write_text(
+        "required_columns: [customer_id]\n"
+        "dtypes:\n"
+        "  customer_id: str\n"
+        "  churn: int\n"
+        "  tenure: float\n"
+    )
+
+    schema = read_yaml_header(path, ["required_columns", "dtypes"], max_lines=3)
+
+    # A truncated `dtypes` mapping must never be returned as if complete
+    assert full_parse_calls == [path]
+    assert dict(schema.dtypes) == {"customer_id": "str", "churn": "int", "tenure": "float"}
+
+
+def test_read_yaml_header_with_document_start(tmp_path, full_parse_calls):
+    path = tmp_path / "schema.yaml"
+    path.write_text(
+        "---\n"
+        "required_columns: [customer_id]\n"
+        "dtypes:\n"
+        "  customer_id: str\n"
+        "description: long tail\n"
+        "notes: never parsed\n"
+    )
+
+    schema = read_yaml_header(path, ["required_columns", "dtypes"], max_lines=4)
+
+    assert full_parse_calls == []
+    assert schema.required_columns == ["customer_id"]
+    assert dict(schema.dtypes) == {"customer_id": "str"}
+
+
+def test_read_yaml_header_with_column_zero_sequences(tmp_path, full_parse_calls):
+    path = tmp_path / "schema.yaml"
+    path.write_text(
+        "required_columns:\n"
+        "- customer_id\n"
+        "- churn\n"
+        "dtypes:\n"
+        "  churn: int\n"
+        "notes: never parsed\n"
+    )
+
+    schema = read_yaml_header(path, ["required_columns", "dtypes"], max_lines=5)
+    assert full_parse_calls == []
+    assert schema.required_columns == ["customer_id", "churn"]
+
+    # Cutting inside the sequence must not return a partial list
+    read_yaml.cache_clear()
+    schema = read_yaml_header(path, ["required_columns"], max_lines=2)
+    assert full_parse_calls == [path]
+    assert schema.required_columns == ["customer_id", "churn"]
+
+
+def test_read_yaml_header_cache_follows_file_changes(tmp_path):
+    path = tmp_path / "schema.yaml"
+    path.write_text("required_columns: [customer_id]\n")
+
+    assert read_yaml_header(path, ["required_columns"]).required_columns == ["customer_id"]
+    hits = common._load_yaml_header_cached.cache_info().hits
+    read_yaml_header(path, ["required_columns"])
+    assert common._load_yaml_header_cached.cache_info().hits == hits + 1
+
+    path.write_text("required_columns: [customer_id, churn]\n")
+    _bump_mtime(path)
+
+    assert read_yaml_header(path, ["required_columns"]).required_columns == ["customer_id", "churn"]
+
+
+@pytest.mark.parametrize("with_schema_dtypes", [False, True])
+def test_load_csv_output_passes_validate_data_schema(tmp_path, caplog, with_schema_dtypes):
+    schema_path = tmp_path / "schema.yaml"
+    schema_path.write_text(
+        "required_columns: [customer_id, churn, amt]\n"
+        "dtypes:\n"
+        "  customer_id: str\n"
+        "  churn: int\n"
+        "  amt: float\n"
+    )
+    csv_path = tmp_path / "customers.csv"
+    csv_path.write_text("customer_id,churn,amt\nc1,0,12.5\nc2,1,99.0\n")
+
+    df = load_csv(csv_path, schema_path=schema_path if with_schema_dtypes else None)
+
+    with caplog.at_level(logging.WARNING, logger="luxottica_churn"):
+        assert validate_data_schema(df, schema_path)
+    assert not [r for r in caplog.records if r.levelno >= logging.WARNING]
+
+
+def test_save_csv_feather_accepts_index_false(tmp_path):
+    path = tmp_path / "features.feather"
+    df = pd.DataFrame({"churn": [0, 1]}, index=pd.Index(["c1", "c2"], name="customer_id"))
+
+    save_csv(df, path, index=False)
+
+    assert load_csv(path).columns.tolist() == ["churn"]
+
+
+def test_save_csv_feather_keeps_non_default_index_as_columns(tmp_path):
+    path = tmp_path / "features.feather"
+    df = pd.DataFrame({"churn": [0, 1]}, index=pd.Index(["c1", "c2"], name="customer_id"))
+
+    save_csv(df, path)
+
+    loaded = load_csv(path)
+    assert loaded.columns.tolist() == ["customer_id", "churn"]
+    assert loaded["customer_id"].tolist() == ["c1", "c2"]
+
+
+def test_save_csv_feather_default_index_roundtrip(tmp_path):
+    path = tmp_path / "features.feather"
+    df = pd.DataFrame({"churn": [0, 1], "amt": [12.5, 99.0]})
+
+    save_csv(df, path, index=False)
+
+    pd.testing.assert_frame_equal(load_csv(path), df)
+
+
+@pytest.fixture
+def mkdir_calls(monkeypatch):
+    calls = []
+    real_mkdir = os.mkdir
+
+    def spy(path, *args, **kwargs):
+        calls.append(path)
+        return real_mkdir(path, *args, **kwargs)
+
+    monkeypatch.setattr(common.os, "mkdir", spy)
+    return calls
+
+
+def test_create_directories_creates_only_missing_levels(tmp_path, mkdir_calls):
+    create_directories([tmp_path / "a" / "b" / "c", tmp_path / "a" / "b", tmp_path / "x", tmp_path / "a" / "b" / "c"])
+
+    assert (tmp_path / "a" / "b" / "c").is_dir() and (tmp_path / "x").is_dir()
+    # Each missing directory once; nothing at or above the existing tmp_path
+    assert sorted(mkdir_calls) == sorted(
+        [tmp_path / "a", tmp_path / "a" / "b", tmp_path / "a" / "b" / "c", tmp_path / "x"]
+    )
+
+
+def test_create_directories_existing_tree_makes_no_mkdir_calls(tmp_path, mkdir_calls):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    mkdir_calls.clear()
+
+    create_directories([tmp_path / "a" / "b", tmp_path / "a"])
+
+    assert mkdir_calls == []
+
+
+def test_create_directories_raises_on_existing_file(tmp_path):
+    (tmp_path / "artifacts").write_text("not a directory")
+
+    with pytest.raises(FileExistsError):
+        create_directories([tmp_path / "artifacts"])
+    with pytest.raises(OSError):
+        create_directories([tmp_path / "artifacts" / "model"])
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_logs_through_direct_handlers(tmp_path):
+    fork_logger = setup_logger(name="luxottica_churn.test_fork", log_dir=str(tmp_path), console_output=False)
+    fork_logger.propagate = False
+
+    pid = os.fork()
+    if pid == 0:  # child: the listener thread is gone, records must be written directly
+        try:
+            direct = not any(isinstance(h, QueueHandler) for h in fork_logger.handlers)
+            fork_logger.info("from child")
+            os._exit(0 if direct and fork_logger._listener is None else 1)
+        except BaseException:
+            os._exit(2)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+    fork_logger.info("from parent")
+    listener = fork_logger._listener
+    atexit.unregister(listener.stop)
+    listener.stop()  # drain the parent's queue
+    (log_file,) = tmp_path.glob("*.log")
+    content = log_file.read_text()
+    assert "from child" in content
+    assert "from parent" in content
+
+
+def test_read_yaml_returns_shared_instance_unless_copy(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("model:\n  name: xgb\n")
+
+    shared = read_yaml(path)
+    assert read_yaml(path) is shared
+
+    private = read_yaml(path, copy=True)
+    assert private is not shared
+    private.model.name = "mutated"
+    assert read_yaml(path).model.name == "xgb"
+
+
+@pytest.mark.parametrize("full_parse_first", [False, True])
+def test_read_yaml_header_copy_is_private(tmp_path, full_parse_first):
+    path = tmp_path / "schema.yaml"
+    path.write_text("required_columns: [customer_id]\ndtypes:\n  customer_id: str\n")
+    if full_parse_first:
+        read_yaml(path)
+
+    private = read_yaml_header(path, ["required_columns", "dtypes"], copy=True)
+    private.required_columns.append("churn")
+    private.dtypes.customer_id = "int"
+
+    assert read_yaml_header(path, ["required_columns", "dtypes"]).required_columns == ["customer_id"]
+    assert read_yaml(path).dtypes.customer_id == "str"
+
+
+def test_save_model_mirrors_files_to_staging_dir(tmp_path):
+    path = tmp_path / "artifacts" / "model.pkl"
+    path.parent.mkdir()
+    staging_dir = tmp_path / "staging"
+
+    save_model(_sample_model(), path, metadata={"algorithm": "XGBoost"}, staging_dir=staging_dir)
+
+    assert sorted(p.name for p in staging_dir.iterdir()) == ["model.pkl", "model.pkl.metadata.json"]
+    assert (staging_dir / "model.pkl").read_bytes() == path.read_bytes()
+    assert (staging_dir / "model.pkl.metadata.json").read_bytes() == (
+        tmp_path / "artifacts" / "model.pkl.metadata.json"
+    ).read_bytes()
+
+
+def test_save_model_staging_into_own_directory_keeps_model(tmp_path):
+    path = tmp_path / "model.pkl"
+
+    save_model(_sample_model(), path, metadata={"algorithm": "XGBoost"}, staging_dir=tmp_path)
+
+    assert load_bin(path)["algorithm"] == "XGBoost"
+    assert (tmp_path / "model.pkl.metadata.json").stat().st_size > 0
+
+
+@pytest.fixture
+def logged_metadata(monkeypatch):
+    logged = []
+
+    def info(msg, *args, **kwargs):
+        if msg == "Model metadata: %s":
+            logged.append(args[0])
+
+    monkeypatch.setattr(common.logger, "info", info)
+    return logged
+
+
+def test_save_model_typed_metadata_roundtrip_with_numpy_values(tmp_path, logged_metadata):
+    path = tmp_path / "model.pkl"
+    metadata = ModelMetadata(
+        algorithm="XGBoost",
+        training_date="2023-10-05",
+        extra={"auc": np.float64(0.9), "classes": np.array([0, 1])},
+    )
+
+    save_model(_sample_model(), path, metadata=metadata)
+    load_model(path)
+
+    assert logged_metadata == [
+        ModelMetadata(
+            algorithm="XGBoost",
+            training_date="2023-10-05",
+            extra={"auc": 0.9, "classes": [0, 1]},
+        )
+    ]
+
+
+def test_load_model_falls_back_to_dict_for_unknown_fields(tmp_path, logged_metadata):
+    path = tmp_path / "model.pkl"
+    metadata = {"algorithm": "XGBoost", "training_date": "2023-10-05", "accuracy": 0.95}
+
+    save_model(_sample_model(), path, metadata=metadata)
+    load_model(path)
+
+    assert logged_metadata == [metadata]
+
+
+def test_save_model_typed_and_dict_metadata_share_format(tmp_path):
+    typed_path = tmp_path / "typed.pkl"
+    dict_path = tmp_path / "dict.pkl"
+    fields = {"algorithm": "XGBoost", "training_date": "2023-10-05", "extra": {"auc": 0.9}}
+
+    save_model(_sample_model(), typed_path, metadata=ModelMetadata(**fields))
+    save_model(_sample_model(), dict_path, metadata=fields)
+
+    assert (tmp_path / "typed.pkl.metadata.json").read_bytes() == (
+        tmp_path / "dict.pkl.metadata.json"
+    ).read_bytes()
+
+
+def test_copy_file_refuses_same_file(tmp_path):
+    path = tmp_path / "model.pkl"
+    path.write_bytes(b"weights")
+
+    with pytest.raises(shutil.SameFileError):
+        copy_file(path, path)
+    assert path.read_bytes() == b"weights"